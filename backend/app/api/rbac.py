@@ -17,18 +17,27 @@ Author: Gerardo Zapico
 Date: July 2025
 """
 
-from fastapi import APIRouter, Query
-from typing import Dict, List
+import anyio
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from kubernetes.client.exceptions import ApiException
+from typing import AsyncIterator, Dict, Iterator, List, TypeVar
 
+from app.core.cache import CACHE_POLICY_KEY
+from app.core.responses import FastJSONResponse
 from app.services.rbac_service import (
     fetch_rules_for_role,
     run_rbac_analysis,
     fetch_rbac_policy_rules,
+    fetch_rbac_policy_rules_bulk,
     who_can,
     get_all_bindings,
+    iter_all_bindings,
 )
 from app.models.rbac import (
     K8sPolicyRule,
+    RbacVerb,
+    RoleKind,
     RbacFinding,
     RbacPolicyRule,
     RbacBinding,
@@ -37,15 +46,49 @@ from app.models.rbac import (
 # Initialize API router for RBAC endpoints
 router = APIRouter()
 
+T = TypeVar("T")
+
+# Lowercase resource name with an optional subresource, or "*"
+RESOURCE_PATTERN = r"^(\*|[a-z][a-z0-9.-]*(/[a-z][a-z0-9.-]*)?)$"
+
+# Response classes for the hottest endpoints; their serializers are built
+# once at import. These endpoints return models assembled by our own
+# services from cluster data, so they return the response directly and skip
+# FastAPI's response_model re-validation. response_model is kept on the
+# routes for the OpenAPI schema only.
+BatchPolicyRulesResponse = FastJSONResponse.for_type(Dict[str, List[RbacPolicyRule]])
+BindingsResponse = FastJSONResponse.for_type(List[RbacBinding])
+
+async def _iterate_in_thread(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Consume a blocking iterator without blocking the event loop.
+    
+    Each next() call runs in a worker thread, so a generator that talks to
+    the cluster can be streamed item by item from an async endpoint.
+    
+    Args:
+        iterator (Iterator[T]): Blocking iterator to consume
+        
+    Yields:
+        T: The items produced by the iterator, in order
+    """
+    sentinel = object()
+    while True:
+        item = await anyio.to_thread.run_sync(next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
 # --- RBAC Security Analysis Endpoint ---
 
 @router.get(
     "/analysis",
     response_model=List[RbacFinding],
     tags=["RBAC"],
-    summary="Get RBAC security analysis findings"
+    summary="Get RBAC security analysis findings",
+    openapi_extra={CACHE_POLICY_KEY: "long"}
 )
-def get_rbac_findings():
+async def get_rbac_findings():
     """
     Retrieve RBAC security analysis findings from the cluster.
     
@@ -58,17 +101,23 @@ def get_rbac_findings():
                           subjects, severity, and recommendations
                           
     Raises:
-        HTTPException: If the analysis fails or rbac-tool is unavailable
+        HTTPException: 503 if the analysis fails or rbac-tool is unavailable.
+                       A 5xx is never cached, and lets the response cache
+                       fall back to the last good result.
     """
-    return run_rbac_analysis()
+    try:
+        return await run_rbac_analysis()
+    except Exception:
+        raise HTTPException(status_code=503, detail="RBAC analysis is unavailable")
 
 @router.get(
     "/policy-rules",
     response_model=List[RbacPolicyRule],
     tags=["RBAC"],
-    summary="Get policy rules for a subject"
+    summary="Get policy rules for a subject",
+    openapi_extra={CACHE_POLICY_KEY: "normal"}
 )
-def get_rbac_policy_rules(
+async def get_rbac_policy_rules(
     subject: str = Query(..., description="Subject name, e.g. 'kubescape'")
 ):
     """
@@ -88,17 +137,22 @@ def get_rbac_policy_rules(
     Raises:
         HTTPException: If the subject is not found or query fails
     """
-    return fetch_rbac_policy_rules(subject=subject)
+    return await fetch_rbac_policy_rules(subject)
 
 @router.get(
     "/who-can",
     response_model=List[Dict],
     tags=["RBAC"],
-    summary="Find subjects who can perform an action"
+    summary="Find subjects who can perform an action",
+    openapi_extra={CACHE_POLICY_KEY: "short"}
 )
-def get_who_can(
-    verb: str = Query(..., description="Action verb, e.g. get, list, delete"),
-    resource: str = Query(..., description="Kubernetes resource, e.g. pods, deployments"),
+async def get_who_can(
+    verb: RbacVerb = Query(..., description="Action verb, e.g. get, list, delete"),
+    resource: str = Query(
+        ...,
+        pattern=RESOURCE_PATTERN,
+        description="Kubernetes resource, e.g. pods, deployments, pods/log"
+    ),
     namespace: str = Query(None, description="Namespace (optional)")
 ):
     """
@@ -109,10 +163,13 @@ def get_who_can(
     type, optionally within a specific namespace.
     
     Args:
-        verb (str): The action verb to check (get, list, create, update, delete, etc.)
+        verb (RbacVerb): The action verb to check (get, list, create, update, delete, etc.)
         resource (str): The Kubernetes resource type (pods, services, deployments, etc.)
         namespace (str, optional): Limit search to a specific namespace
         
+    Unknown verbs and malformed resource names are rejected with a 422
+    before any cluster query is made.
+        
     Returns:
         List[Dict]: List of authorization rules showing subjects with the permission
                    Each dict contains subject, namespace, and role information
@@ -121,15 +178,19 @@ def get_who_can(
         GET /rbac/who-can?verb=delete&resource=pods&namespace=default
         Returns all subjects who can delete pods in the default namespace
     """
-    return who_can(verb, resource, namespace)
+    return await anyio.to_thread.run_sync(who_can, verb, resource, namespace)
 
 @router.get(
     "/bindings",
     response_model=List[RbacBinding],
+    response_class=BindingsResponse,
     tags=["RBAC"],
-    summary="List all RBAC bindings"
+    summary="List all RBAC bindings",
+    openapi_extra={CACHE_POLICY_KEY: "normal"}
 )
-def list_bindings():
+async def list_bindings(
+    include_raw: bool = Query(True, description="Include the raw YAML of each binding")
+):
     """
     Retrieve all RBAC bindings in the cluster.
     
@@ -137,25 +198,81 @@ def list_bindings():
     ClusterRoleBindings in the cluster, including their subjects, role
     references, and raw YAML representations.
     
+    Args:
+        include_raw (bool): Whether to render the raw YAML of each binding;
+                           list views can pass false to get a lighter response
+        
     Returns:
         List[RbacBinding]: Complete list of RBAC bindings with subjects,
                           role references, and metadata
                           
+    Raises:
+        HTTPException: 503 if the bindings cannot be listed from the cluster
+                          
     Note:
         This operation may take time in clusters with many bindings.
         The raw YAML data is included for detailed inspection.
     """
-    return get_all_bindings()
+    try:
+        bindings = await anyio.to_thread.run_sync(get_all_bindings, include_raw)
+    except ApiException:
+        raise HTTPException(status_code=503, detail="RBAC bindings are unavailable")
+    return BindingsResponse(bindings)
+
+@router.get(
+    "/bindings/stream",
+    response_class=StreamingResponse,
+    tags=["RBAC"],
+    summary="Stream all RBAC bindings as NDJSON",
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+async def stream_bindings(
+    include_raw: bool = Query(True, description="Include the raw YAML of each binding")
+):
+    """
+    Stream all RBAC bindings in the cluster as newline-delimited JSON.
+    
+    Returns the same bindings as GET /rbac/bindings, but writes each one as
+    soon as it has been converted, one JSON object per line. Clients can
+    start rendering before the whole cluster has been processed, and the
+    backend only holds one binding in memory at a time.
+    
+    Args:
+        include_raw (bool): Whether to render the raw YAML of each binding
+        
+    Returns:
+        StreamingResponse: An application/x-ndjson body where every line
+                          is a serialized RbacBinding
+                          
+    Raises:
+        HTTPException: 503 if the bindings cannot be listed from the cluster;
+                       raised before the stream starts
+                          
+    Example:
+        GET /rbac/bindings/stream
+        Returns one line per binding, ClusterRoleBindings first
+    """
+    try:
+        bindings = await anyio.to_thread.run_sync(iter_all_bindings, include_raw)
+    except ApiException:
+        raise HTTPException(status_code=503, detail="RBAC bindings are unavailable")
+
+    async def ndjson_lines() -> AsyncIterator[bytes]:
+        async for binding in _iterate_in_thread(bindings):
+            yield binding.model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 @router.get(
     "/roles",
     response_model=List[K8sPolicyRule],
     tags=["RBAC"],
-    summary="Get rules for a specific role"
+    summary="Get rules for a specific role",
+    openapi_extra={CACHE_POLICY_KEY: "normal"}
 )
-def get_rules_for_role(
+async def get_rules_for_role(
     role_name: str = Query(..., description="Role name"),
-    kind: str = Query(..., description="Role kind (Role/ClusterRole)"),
+    kind: RoleKind = Query(..., description="Role kind (Role/ClusterRole)"),
     namespace: str = Query(None, description="Namespace (optional)")
 ):
     """
@@ -166,7 +283,8 @@ def get_rules_for_role(
     
     Args:
         role_name (str): Name of the Role or ClusterRole
-        kind (str): Type of role - must be either "Role" or "ClusterRole"
+        kind (RoleKind): Type of role - must be either "Role" or "ClusterRole";
+                         any other value is rejected with a 422
         namespace (str, optional): Namespace (required for Roles, ignored for ClusterRoles)
         
     Returns:
@@ -181,15 +299,17 @@ def get_rules_for_role(
         GET /rbac/roles?role_name=admin&kind=ClusterRole
         Returns all policy rules for the cluster-admin ClusterRole
     """
-    return fetch_rules_for_role(role_name, kind, namespace)
+    return await anyio.to_thread.run_sync(fetch_rules_for_role, role_name, kind, namespace)
 
 @router.get(
     "/policy-rules/batch",
     response_model=Dict[str, List[RbacPolicyRule]],
+    response_class=BatchPolicyRulesResponse,
     tags=["RBAC"],
-    summary="Get policy rules for multiple subjects"
+    summary="Get policy rules for multiple subjects",
+    openapi_extra={CACHE_POLICY_KEY: "normal"}
 )
-def get_batch_policy_rules(
+async def get_batch_policy_rules(
     subjects: List[str] = Query(..., description="List of subject names to query")
 ):
     """
@@ -197,7 +317,8 @@ def get_batch_policy_rules(
     
     This endpoint optimizes the policy rule retrieval by accepting multiple
     subject names via query parameters and returning their policy rules in a single response,
-    reducing the number of HTTP requests from N to 1.
+    reducing the number of HTTP requests from N to 1. Uncached subjects are resolved
+    together with a single rbac-tool run.
     
     Args:
         subjects (List[str]): List of subject names to query policy rules for
@@ -218,26 +339,16 @@ def get_batch_policy_rules(
         Be aware of URL length limitations when querying many subjects.
         Consider using shorter subject names or fewer subjects per request if you encounter issues.
     """
-    results = {}
-    
-    for subject in subjects:
-        try:
-            rules = fetch_rbac_policy_rules(subject=subject)
-            results[subject] = rules
-        except Exception as e:
-            # En lugar de fallar completamente, registrar el error y continuar
-            print(f"[ERROR] Failed to fetch policy rules for subject '{subject}': {e}")
-            results[subject] = []  # Retornar lista vacía en caso de error
-    
-    return results
+    return BatchPolicyRulesResponse(await fetch_rbac_policy_rules_bulk(subjects))
 
 @router.post(
     "/policy-rules/batch",
     response_model=Dict[str, List[RbacPolicyRule]],
+    response_class=BatchPolicyRulesResponse,
     tags=["RBAC"],
     summary="Get policy rules for multiple subjects (fallback for large requests)"
 )
-def get_batch_policy_rules_post(
+async def get_batch_policy_rules_post(
     subjects: List[str]
 ):
     """
@@ -262,14 +373,4 @@ def get_batch_policy_rules_post(
             "system:serviceaccount:default:app1": [...]
         }
     """
-    results = {}
-    
-    for subject in subjects:
-        try:
-            rules = fetch_rbac_policy_rules(subject=subject)
-            results[subject] = rules
-        except Exception as e:
-            print(f"[ERROR] Failed to fetch policy rules for subject '{subject}': {e}")
-            results[subject] = []
-    
-    return results
\ No newline at end of file
+    return BatchPolicyRulesResponse(await fetch_rbac_policy_rules_bulk(subjects))
\ No newline at end of file
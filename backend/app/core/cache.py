@@ -0,0 +1,266 @@
+# backend/app/core/cache.py
+"""
+Caching Module
+
+This module provides the in-process caching primitives used by Kube-Guard to
+avoid re-running expensive cluster scans on every HTTP request. The cluster's
+RBAC state changes on the order of seconds to minutes, so short-lived cached
+results are almost always as good as fresh ones.
+
+It contains:
+- A small thread-safe TTL cache used by the API and service layers
+- An HTTP middleware that caches GET responses per route, with
+  stale-on-error fallback when the underlying handler fails
+
+Author: Gerardo Zapico
+Date: July 2025
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+# Time-to-live, in seconds, of each cache policy a route can opt into
+CACHE_TTLS: Dict[str, float] = {
+    "short": 5,
+    "normal": 30,
+    "long": 300,
+}
+
+# OpenAPI extension key used by routes to select a cache policy,
+# e.g. @router.get(..., openapi_extra={CACHE_POLICY_KEY: "normal"})
+CACHE_POLICY_KEY = "x-cache"
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded cache whose entries expire after a time-to-live.
+
+    Expired entries are not dropped eagerly: they stay available through
+    get_stale() until they are overwritten or evicted, so callers can fall
+    back to the last known value when a refresh fails. When the cache is
+    full, the least recently used entry is evicted.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept in the cache
+        ttl (Optional[float]): Default time-to-live in seconds, or None
+                               for entries that never expire
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key if it has not expired yet.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key, even if it has already expired.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store value under key.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl (Optional[float]): Time-to-live in seconds for this entry;
+                                   defaults to the cache-wide ttl
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def reserve(self, size: int) -> None:
+        """
+        Grow the cache so that it can hold at least size entries.
+        
+        Callers that walk the same N keys on every pass should reserve N
+        first: an LRU cache smaller than the working set evicts each entry
+        just before it would be reused. The cache never shrinks.
+        
+        Args:
+            size (int): Number of entries the cache must be able to hold
+        """
+        with self._lock:
+            self.maxsize = max(self.maxsize, size)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Cache successful GET responses of routes that opt into a cache policy.
+
+    Routes select a policy from CACHE_TTLS through their OpenAPI extras.
+    Responses are keyed on the request path and its sorted query parameters.
+    On a cache hit the handler is not invoked at all. When a handler raises
+    or answers with a server error and an expired entry is still available,
+    that stale response is served instead with a "Warning: 110" header.
+
+    Every response passing through a cached route carries an "X-Cache"
+    header set to HIT, MISS or STALE and an "ETag" computed once when the
+    body is stored. Fresh responses carry a "Cache-Control: max-age" equal
+    to the entry's remaining lifetime, so browsers never keep a response
+    longer than the server would; stale ones carry "no-cache". The
+    ETag is weak: the gzip middleware may re-encode the body, and a weak
+    validator stays valid across content encodings of the same data.
+    Requests whose "If-None-Match" header matches the current ETag get an
+    empty 304 Not Modified response instead of the body.
+    """
+
+    def __init__(self, app, maxsize: int = 1024):
+        super().__init__(app)
+        self.cache = TTLCache(maxsize=maxsize)
+        self._policies: Optional[Dict[str, str]] = None
+
+    def _route_policies(self, request: Request) -> Dict[str, str]:
+        """Map the path of every cacheable GET route to its cache policy."""
+        if self._policies is None:
+            policies = {}
+            for route in request.app.routes:
+                if not isinstance(route, APIRoute) or "GET" not in route.methods:
+                    continue
+                policy = (route.openapi_extra or {}).get(CACHE_POLICY_KEY)
+                if policy in CACHE_TTLS:
+                    policies[route.path] = policy
+            self._policies = policies
+        return self._policies
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method != "GET":
+            return await call_next(request)
+        policy = self._route_policies(request).get(request.url.path)
+        if policy is None:
+            return await call_next(request)
+
+        ttl = CACHE_TTLS[policy]
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._build_response(request, cached, "HIT")
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            stale = self.cache.get_stale(key)
+            if stale is None:
+                raise
+            return self._build_response(request, stale, "STALE")
+
+        if response.status_code >= 500:
+            stale = self.cache.get_stale(key)
+            if stale is not None:
+                return self._build_response(request, stale, "STALE")
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        entry = (response.status_code, response.headers.raw, body, etag, time.monotonic() + ttl)
+        self.cache.set(key, entry, ttl=ttl)
+        return self._build_response(request, entry, "MISS")
+
+    @staticmethod
+    def _build_response(
+        request: Request,
+        entry: Tuple[int, list, bytes, str, float],
+        status: str,
+    ) -> Response:
+        """
+        Rebuild a response from a cache entry and tag it with its cache status.
+
+        Returns an empty 304 response when the request's If-None-Match
+        header already names the entry's ETag.
+        """
+        status_code, raw_headers, body, etag, expires_at = entry
+        headers = {"ETag": etag, "X-Cache": status}
+        if status == "STALE":
+            headers["Cache-Control"] = "no-cache"
+            headers["Warning"] = '110 - "Response is Stale"'
+        else:
+            remaining = max(0, int(expires_at - time.monotonic()))
+            headers["Cache-Control"] = f"max-age={remaining}"
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        response = Response(content=body, status_code=status_code)
+        response.raw_headers = list(raw_headers)
+        response.headers.update(headers)
+        return response
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether an If-None-Match header value matches an ETag.
+    
+    Uses the weak comparison required for If-None-Match: "W/" prefixes
+    are ignored on both sides.
+
+    Args:
+        if_none_match (Optional[str]): Raw If-None-Match header, possibly a
+                                       comma-separated list or "*"
+        etag (str): ETag of the current representation
+
+    Returns:
+        bool: True if the client already has the current representation
+    """
+    if not if_none_match:
+        return False
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
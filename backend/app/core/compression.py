@@ -0,0 +1,59 @@
+# backend/app/core/compression.py
+"""
+Response Compression Module
+
+This module provides the gzip middleware used by Kube-Guard. It behaves
+like Starlette's GZipMiddleware, except that streamed responses are flushed
+after every chunk, so clients such as the NDJSON bindings stream receive
+each part as soon as it is produced instead of when the stream ends.
+
+Author: Gerardo Zapico
+Date: July 2025
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Receive, Scope, Send
+
+class FlushingGZipResponder(GZipResponder):
+    """
+    Gzip responder that emits a complete deflate block for every chunk.
+
+    Starlette's responder keeps streamed chunks inside the compressor until
+    the body ends. Here every non-final chunk is followed by a Z_SYNC_FLUSH,
+    which costs a few bytes of compression ratio per chunk but lets the
+    client decompress and use each chunk right away. Single-message
+    responses are unaffected.
+
+    This overrides GZipResponder's apply_compression hook and uses its
+    gzip_file/gzip_buffer attributes, which are not public API. Starlette
+    is pinned in requirements.txt, and tests/test_compression.py fails if
+    streamed chunks stop being flushed one by one.
+    """
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        self.gzip_file.write(body)
+        if more_body:
+            # GzipFile.flush() defaults to zlib.Z_SYNC_FLUSH
+            self.gzip_file.flush()
+        else:
+            self.gzip_file.close()
+
+        body = self.gzip_buffer.getvalue()
+        self.gzip_buffer.seek(0)
+        self.gzip_buffer.truncate()
+        return body
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that flushes streamed responses chunk by chunk.
+
+    Takes the same arguments as Starlette's GZipMiddleware.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = FlushingGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
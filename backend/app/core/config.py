@@ -10,8 +10,21 @@ Author: Gerardo Zapico
 Date: July 2025
 """
 
-from kubernetes import config
+from functools import cache
+from kubernetes import client, config
 import logging
+import threading
+from typing import Optional
+
+# Maximum number of keep-alive connections pooled per API server host
+K8S_CONNECTION_POOL_MAXSIZE = 64
+
+# Shared API client, created once the configuration has been loaded
+_api_client: Optional[client.ApiClient] = None
+
+# Guards creation and closing of the shared client, which worker threads
+# may request concurrently
+_api_client_lock = threading.Lock()
 
 def load_k8s_config():
     """
@@ -40,4 +53,49 @@ def load_k8s_config():
         # Fallback to local kubeconfig file
         # This is used for local development and testing
         config.load_kube_config()
-        logging.info("✅ Loaded local kubeconfig.")
\ No newline at end of file
+        logging.info("✅ Loaded local kubeconfig.")
+
+def get_api_client() -> client.ApiClient:
+    """
+    Return the long-lived Kubernetes API client shared by all services.
+    
+    The client is created on first use from the configuration loaded by
+    load_k8s_config(), with a connection pool large enough for concurrent
+    requests. Reusing it keeps TLS connections to the API server alive
+    across requests instead of opening a new pool for every call.
+    
+    Returns:
+        kubernetes.client.ApiClient: The shared API client
+    """
+    global _api_client
+    if _api_client is None:
+        with _api_client_lock:
+            if _api_client is None:
+                cfg = client.Configuration.get_default_copy()
+                cfg.connection_pool_maxsize = K8S_CONNECTION_POOL_MAXSIZE
+                _api_client = client.ApiClient(cfg)
+    return _api_client
+
+@cache
+def get_rbac_api() -> client.RbacAuthorizationV1Api:
+    """
+    Return the RBAC Authorization API wrapper shared by all services.
+    
+    Built once on top of the shared API client, so hot paths don't pay for
+    constructing a new API object on every call.
+    
+    Returns:
+        kubernetes.client.RbacAuthorizationV1Api: The shared RBAC API
+    """
+    return client.RbacAuthorizationV1Api(get_api_client())
+
+def close_api_client():
+    """
+    Close the shared Kubernetes API client and its connection pool, if open.
+    """
+    global _api_client
+    with _api_client_lock:
+        get_rbac_api.cache_clear()
+        if _api_client is not None:
+            _api_client.close()
+            _api_client = None
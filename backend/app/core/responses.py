@@ -0,0 +1,52 @@
+# backend/app/core/responses.py
+"""
+Response Classes Module
+
+This module provides JSON response classes that serialize endpoint results
+with precompiled Pydantic TypeAdapters. Endpoints that return data built by
+our own services can hand it straight to one of these responses, skipping
+FastAPI's generic response_model validation and model -> dict -> JSON
+round-trip.
+
+Author: Gerardo Zapico
+Date: July 2025
+"""
+
+from typing import Any, ClassVar, Optional, Type
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    JSON response rendered directly by a Pydantic TypeAdapter.
+
+    Use for_type() to create a subclass bound to the type of the content.
+    The adapter is built once, when the subclass is created, and renders
+    models to JSON bytes in pydantic-core without validating them again.
+    Without an adapter the response falls back to plain orjson rendering.
+
+    Example:
+        BindingsResponse = FastJSONResponse.for_type(List[RbacBinding])
+        return BindingsResponse(get_all_bindings())
+    """
+
+    adapter: ClassVar[Optional[TypeAdapter]] = None
+
+    def render(self, content: Any) -> bytes:
+        if self.adapter is None:
+            return super().render(content)
+        return self.adapter.dump_json(content)
+
+    @classmethod
+    def for_type(cls, tp: Any) -> Type["FastJSONResponse"]:
+        """
+        Create a response class that serializes content of the given type.
+
+        Args:
+            tp: The type of the content, e.g. List[RbacBinding]
+
+        Returns:
+            Type[FastJSONResponse]: A subclass bound to a TypeAdapter for tp
+        """
+        return type(cls.__name__, (cls,), {"adapter": TypeAdapter(tp)})
@@ -10,16 +10,26 @@ Author: Gerardo Zapico
 Date: July 2025
 """
 
+import asyncio
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+import httpx
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api import rbac
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import load_k8s_config
+from app.core.config import close_api_client, get_api_client, load_k8s_config
+from app.core.cache import ResponseCacheMiddleware
+from app.core.compression import StreamingGZipMiddleware
 
 # Initialize FastAPI application with title and documentation
 app = FastAPI(
     title="Kube-Guard API",
     description="A security analysis tool for Kubernetes RBAC configurations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add health endpoints for Kubernetes
@@ -44,17 +54,94 @@ async def metrics():
     """Basic metrics endpoint (simple text format)"""
     return {"metrics": "# HELP kube_guard_up Application status\nkube_guard_up 1\n"}
 
-def startup():
+# Application log records are handed to a queue and written by a background
+# listener thread, so request handlers never block on log I/O
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(), respect_handler_level=True)
+
+def setup_logging():
+    """
+    Route the application's loggers through a non-blocking queue handler.
+    
+    Records emitted under the "app" logger hierarchy are enqueued and
+    written to stderr by a listener thread started here.
+    """
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(QueueHandler(_log_queue))
+    app_logger.propagate = False
+    _log_listener.start()
+
+logger = logging.getLogger(__name__)
+
+# Slow cached endpoints requested once in the background after startup
+WARMUP_PATHS = ("/rbac/bindings", "/rbac/analysis")
+
+async def warm_up_cache():
+    """
+    Prime the response cache for the slowest endpoints.
+    
+    Requests every path in WARMUP_PATHS through the application itself, so
+    the full route -> service -> cluster path runs once and its response is
+    stored by ResponseCacheMiddleware. The first dashboard load then hits a
+    warm cache and connection pool instead of paying for cold rbac-tool and
+    kube-API calls. The trade-off is some extra cluster load right after
+    startup, which runs in the background and never delays readiness.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://kube-guard") as http:
+        for path in WARMUP_PATHS:
+            try:
+                await http.get(path)
+            except Exception as e:
+                logger.warning("Cache warm-up request to %s failed: %s", path, e)
+
+async def startup():
     """
     Application startup event handler.
     
-    Loads Kubernetes configuration on application startup to establish
-    connection with the cluster. This is called once when the server starts.
+    Sets up logging, loads Kubernetes configuration and creates the shared
+    API client used to talk to the cluster, then starts warming the response
+    cache in the background. This is called once when the server starts.
     """
+    setup_logging()
     load_k8s_config()
+    # Create the shared client now rather than on the first request
+    get_api_client()
+    # Keep a reference so the background task is not garbage collected
+    app.state.warmup = asyncio.get_running_loop().create_task(warm_up_cache())
 
-# Register startup event handler
+async def shutdown():
+    """
+    Application shutdown event handler.
+    
+    Cancels the cache warm-up if it is still running and waits for it to
+    stop, so it cannot use the shared Kubernetes API client after that
+    client is closed. Then closes the client, flushes pending log records
+    and stops the logging listener thread.
+    """
+    warmup = getattr(app.state, "warmup", None)
+    if warmup is not None:
+        warmup.cancel()
+        try:
+            await warmup
+        except asyncio.CancelledError:
+            pass
+    close_api_client()
+    _log_listener.stop()
+
+# Register startup and shutdown event handlers
 app.add_event_handler("startup", startup)
+app.add_event_handler("shutdown", shutdown)
+
+# Cache GET responses of routes that declare a cache policy, serving the
+# last good response if a refresh fails (see app.core.cache)
+app.add_middleware(ResponseCacheMiddleware)
+
+# Compress responses larger than 1 KB for clients that accept gzip; RBAC
+# payloads repeat the same role names, verbs and subjects and shrink well.
+# Added after the cache so cached bodies are stored uncompressed. Streamed
+# responses are flushed per chunk (see app.core.compression).
+app.add_middleware(StreamingGZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Configure CORS middleware for frontend communication
 # Note: In production, replace "*" with specific frontend URLs for security
@@ -16,8 +16,18 @@ Author: Gerardo Zapico
 Date: July 2025
 """
 
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional, List
+
+# Verbs accepted by permission queries ("*" matches rules granting any verb)
+RbacVerb = Literal[
+    "get", "list", "watch", "create", "update", "patch", "delete",
+    "deletecollection", "impersonate", "bind", "escalate", "use",
+    "approve", "sign", "*",
+]
+
+# Kinds of role that can hold policy rules
+RoleKind = Literal["Role", "ClusterRole"]
 
 class RbacOrigin(BaseModel):
     """
@@ -83,7 +93,7 @@ class FindingDetails(BaseModel):
     Recommendation: str
     RuleName: str
     RuleUuid: str
-    References: Optional[List[str]] = []
+    References: Optional[List[str]] = Field(default_factory=list)
 
 class RbacFinding(BaseModel):
     """
@@ -96,6 +106,21 @@ class RbacFinding(BaseModel):
     Subject: Subject
     Finding: FindingDetails
 
+class RbacPolicyRule(BaseModel):
+    """
+    Represents a policy rule with its allowed actions.
+    
+    Attributes:
+        kind (str): Type of policy ('Role' or 'ClusterRole')
+        name (str): Name of the policy
+        namespace (Optional[str]): Namespace (for Roles only)
+        allowedTo (List[RbacAllowedAction]): List of permitted actions
+    """
+    kind: str
+    name: str
+    namespace: Optional[str] = None
+    allowedTo: List[RbacAllowedAction]
+
 class RbacFindingWithRules(RbacFinding):
     """
     Extended RBAC finding that includes detailed policy rules and context.
@@ -110,28 +135,13 @@ class RbacFindingWithRules(RbacFinding):
         Verb (Optional[str]): Specific action verb
     """
     AllowedActions: List[RbacAllowedAction]
-    PolicyRules: List['RbacPolicyRule']  
+    PolicyRules: List[RbacPolicyRule]
     Namespace: Optional[str] = None
     Resource: Optional[str] = None
     ResourceName: Optional[str] = None
     NonResourceURL: Optional[str] = None
     Verb: Optional[str] = None
     
-class RbacPolicyRule(BaseModel):
-    """
-    Represents a policy rule with its allowed actions.
-    
-    Attributes:
-        kind (str): Type of policy ('Role' or 'ClusterRole')
-        name (str): Name of the policy
-        namespace (Optional[str]): Namespace (for Roles only)
-        allowedTo (List[RbacAllowedAction]): List of permitted actions
-    """
-    kind: str
-    name: str
-    namespace: Optional[str] = None
-    allowedTo: List[RbacAllowedAction]
-
 class K8sPolicyRule(BaseModel):
     """
     Represents a Kubernetes native policy rule structure.
@@ -146,11 +156,14 @@ class K8sPolicyRule(BaseModel):
         resourceNames (Optional[List[str]]): Specific resource names
         nonResourceURLs (Optional[List[str]]): Non-resource URL paths
     """
+    # Immutable: built once from cluster data and only ever read afterwards
+    model_config = ConfigDict(frozen=True)
+
     verbs: List[str]
-    apiGroups: Optional[List[str]] = []
-    resources: Optional[List[str]] = []
-    resourceNames: Optional[List[str]] = []
-    nonResourceURLs: Optional[List[str]] = []
+    apiGroups: Optional[List[str]] = Field(default_factory=list)
+    resources: Optional[List[str]] = Field(default_factory=list)
+    resourceNames: Optional[List[str]] = Field(default_factory=list)
+    nonResourceURLs: Optional[List[str]] = Field(default_factory=list)
 
 class RbacSubject(BaseModel):
     """
@@ -162,6 +175,9 @@ class RbacSubject(BaseModel):
         apiGroup (Optional[str]): API group (typically empty for core subjects)
         namespace (Optional[str]): Namespace for ServiceAccounts
     """
+    # Immutable so identical subjects can be shared between bindings
+    model_config = ConfigDict(frozen=True)
+
     kind: str
     name: str
     apiGroup: Optional[str] = ""
@@ -177,6 +193,9 @@ class RbacRoleRef(BaseModel):
         apiGroup (Optional[str]): API group (typically 'rbac.authorization.k8s.io')
         namespace (Optional[str]): Namespace (for Role references)
     """
+    # Immutable so identical role references can be shared between bindings
+    model_config = ConfigDict(frozen=True)
+
     kind: str
     name: str
     apiGroup: Optional[str] = ""
@@ -194,6 +213,9 @@ class RbacBinding(BaseModel):
         roleRef (RbacRoleRef): Reference to the role being bound
         raw (Optional[str]): Raw YAML representation of the binding
     """
+    # Immutable: built once from cluster data and only ever read afterwards
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     kind: str  # RoleBinding o ClusterRoleBinding
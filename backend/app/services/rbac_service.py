@@ -18,23 +18,133 @@ Author: Gerardo Zapico
 Date: July 2025
 """
 
+import anyio
+from functools import cache, lru_cache
 from kubernetes import client
-import subprocess, json
-from kubernetes.client import V1ClusterRoleBinding, V1RoleBinding
+import logging, os, re, tempfile
+import orjson
 import yaml
 from app.models.rbac import K8sPolicyRule, RbacFinding, RbacPolicyRule, RbacBinding, RbacSubject, RbacRoleRef
-from typing import Dict, List
+from app.core.cache import TTLCache
+from app.core.config import get_api_client, get_rbac_api
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import TypeAdapter
 
-def _setup_rbac_tool_env():
+logger = logging.getLogger(__name__)
+
+# Prefer the libyaml-backed dumper; the pure-Python one is several times slower
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
+    logger.warning("PyYAML was built without libyaml; falling back to the pure-Python YAML dumper")
+
+# Validators for rbac-tool JSON output, built once so every run validates
+# the whole list in a single pydantic-core call
+_findings_adapter = TypeAdapter(List[RbacFinding])
+_policy_rules_adapter = TypeAdapter(List[RbacPolicyRule])
+
+# Seconds an rbac-tool invocation may run before it is killed
+RBAC_TOOL_TIMEOUT = 30
+
+# Maximum number of rbac-tool processes running at the same time
+RBAC_TOOL_MAX_CONCURRENCY = 16
+
+# Limits concurrent rbac-tool processes; created on first use so that it
+# is bound to the running event loop
+_rbac_tool_semaphore: Optional[anyio.Semaphore] = None
+
+# Seconds a cluster-wide rbac-tool analysis is served from memory
+ANALYSIS_TTL = 60
+
+# Seconds a failed analysis is remembered before rbac-tool is run again
+ANALYSIS_ERROR_TTL = 5
+
+# Latest analysis, or a _FailedLookup for the latest failure
+_analysis_cache = TTLCache(maxsize=1, ttl=ANALYSIS_TTL)
+
+# Serializes analysis runs so concurrent cache misses share one rbac-tool
+# process; created on first use so that it is bound to the running event loop
+_analysis_lock: Optional[anyio.Lock] = None
+
+# Seconds a subject's policy rules are served from memory
+POLICY_RULES_TTL = 30
+
+# Seconds a failed policy-rules lookup is remembered before retrying
+POLICY_RULES_ERROR_TTL = 5
+
+# Per-subject cache of rbac-tool policy-rules results (or a _FailedLookup)
+_policy_rules_cache = TTLCache(maxsize=10_000, ttl=POLICY_RULES_TTL)
+
+class _FailedLookup:
+    """
+    Negative cache entry for an rbac-tool lookup that raised.
+    
+    Only a description of the error is kept, never the exception itself:
+    re-raising one cached instance would share it between requests and
+    grow its traceback on every raise.
+    """
+    __slots__ = ("reason",)
+
+    def __init__(self, error: Exception):
+        self.reason = f"{type(error).__name__}: {error}"
+
+# Seconds a cluster-wide list of RBAC objects is reused across requests
+RBAC_LIST_TTL = 5
+
+# Latest list of each RBAC kind, shared by who_can and the bindings views
+_rbac_list_cache = TTLCache(maxsize=8, ttl=RBAC_LIST_TTL)
+
+def _list_rbac_objects(kind: str) -> list:
+    """
+    List every RBAC object of a kind across the cluster, with a short-lived cache.
+    
+    Lists are served from the API server's watch cache (resourceVersion "0")
+    rather than a quorum read from etcd, and the result is reused for
+    RBAC_LIST_TTL seconds. RBAC objects change rarely, so a few seconds of
+    staleness is an acceptable trade for not re-listing on every request.
+    Callers must treat the returned objects as read-only.
+    
+    Args:
+        kind (str): One of "ClusterRoleBinding", "RoleBinding", "ClusterRole" or "Role"
+        
+    Returns:
+        list: The Kubernetes API objects of that kind, in all namespaces
+        
+    Raises:
+        kubernetes.client.exceptions.ApiException: If the list call fails
+    """
+    items = _rbac_list_cache.get(kind)
+    if items is not None:
+        return items
+
+    rbac = get_rbac_api()
+    list_calls = {
+        "ClusterRoleBinding": rbac.list_cluster_role_binding,
+        "RoleBinding": rbac.list_role_binding_for_all_namespaces,
+        "ClusterRole": rbac.list_cluster_role,
+        "Role": rbac.list_role_for_all_namespaces,
+    }
+    items = list_calls[kind](resource_version="0").items
+    _rbac_list_cache.set(kind, items)
+    return items
+
+@cache
+def _setup_rbac_tool_env() -> Optional[str]:
     """
     Set up environment variables for rbac-tool to use in-cluster authentication.
     
     When running inside a Kubernetes pod, rbac-tool needs to be configured
     to use the ServiceAccount token for cluster authentication. This function
     sets the necessary environment variables.
-    """
-    import os
     
+    The kubeconfig is written once per process, to a uniquely named file,
+    and reused by every later call. It references the token file rather
+    than embedding the token, so rotated tokens are still picked up.
+    
+    Returns:
+        Optional[str]: Path of the generated kubeconfig, or None outside a pod
+    """
     # Check if we're running in a Kubernetes pod
     if os.path.exists('/var/run/secrets/kubernetes.io/serviceaccount'):
         # Set KUBECONFIG to use in-cluster authentication
@@ -58,10 +168,12 @@ users:
   user:
     tokenFile: /var/run/secrets/kubernetes.io/serviceaccount/token
 """
-        # Write kubeconfig to a temporary file
-        kubeconfig_path = "/tmp/kubeconfig"
-        with open(kubeconfig_path, 'w') as f:
+        # Write kubeconfig to a temporary file unique to this process
+        with tempfile.NamedTemporaryFile(
+            "w", prefix="kube-guard-", suffix=".kubeconfig", delete=False
+        ) as f:
             f.write(kubeconfig_content)
+        kubeconfig_path = f.name
         
         # Set KUBECONFIG environment variable
         os.environ['KUBECONFIG'] = kubeconfig_path
@@ -69,7 +181,39 @@ users:
     
     return None
 
-def run_rbac_analysis() -> List[RbacFinding]:
+async def _run_rbac_tool(*args: str, timeout: float = RBAC_TOOL_TIMEOUT) -> bytes:
+    """
+    Run rbac-tool as an asynchronous subprocess and return its stdout.
+    
+    The process is awaited on the event loop instead of blocking a worker
+    thread, and at most RBAC_TOOL_MAX_CONCURRENCY processes run at once so
+    that bursts of requests cannot fork an unbounded number of children.
+    A process that exceeds the timeout is killed.
+    
+    Args:
+        *args (str): Arguments passed to rbac-tool
+        timeout (float): Seconds to wait for the process to finish
+        
+    Returns:
+        bytes: The raw standard output of rbac-tool
+        
+    Raises:
+        subprocess.CalledProcessError: If rbac-tool exits with a non-zero status
+        TimeoutError: If rbac-tool does not finish within the timeout
+    """
+    global _rbac_tool_semaphore
+    if _rbac_tool_semaphore is None:
+        _rbac_tool_semaphore = anyio.Semaphore(RBAC_TOOL_MAX_CONCURRENCY)
+
+    # Set up in-cluster authentication for rbac-tool
+    _setup_rbac_tool_env()
+
+    async with _rbac_tool_semaphore:
+        with anyio.fail_after(timeout):
+            result = await anyio.run_process(["rbac-tool", *args], check=True)
+    return result.stdout
+
+async def run_rbac_analysis() -> List[RbacFinding]:
     """
     Run comprehensive RBAC security analysis using rbac-tool.
     
@@ -81,33 +225,49 @@ def run_rbac_analysis() -> List[RbacFinding]:
         List[RbacFinding]: List of security findings with severity levels,
                           messages, and recommendations
                           
+    Raises:
+        Exception: Whatever made the analysis fail (rbac-tool missing, a
+                   non-zero exit, a timeout or unparsable output)
+        RuntimeError: If the analysis failed within the last
+                      ANALYSIS_ERROR_TTL seconds
+                          
     Note:
         Requires rbac-tool to be installed and accessible in PATH.
-        Falls back to empty list if the tool is unavailable or fails.
         Automatically configures in-cluster authentication when running in a pod.
+        Successful results are reused for ANALYSIS_TTL seconds, and callers
+        arriving while an analysis is running wait for its outcome instead
+        of starting another one. A failure is remembered for the shorter
+        ANALYSIS_ERROR_TTL, so callers queued behind a failing run fail
+        right away rather than each re-running rbac-tool in turn.
     """
-    try:
-        # Set up in-cluster authentication for rbac-tool
-        _setup_rbac_tool_env()
-        
-        # Execute rbac-tool analysis with JSON output
-        result = subprocess.run(
-            ["rbac-tool", "analysis", "-o", "json"],
-            capture_output=True,
-            check=True,
-            timeout=30  # Prevent hanging on large clusters
-        )
-        
-        # Parse JSON output and extract findings
-        output = json.loads(result.stdout)
-        findings = output.get("Findings", [])
-        return [RbacFinding(**f) for f in findings]
-    except Exception as e:
-        # Log error and return empty list for graceful degradation
-        print(f"[RBAC TOOL ERROR] {e}")
-        return []
-
-def fetch_rbac_policy_rules(subject: str) -> List[RbacPolicyRule]:
+    global _analysis_lock
+    if _analysis_lock is None:
+        _analysis_lock = anyio.Lock()
+
+    async with _analysis_lock:
+        cached = _analysis_cache.get("findings")
+        if isinstance(cached, _FailedLookup):
+            raise RuntimeError(f"RBAC analysis failed recently: {cached.reason}")
+        if cached is not None:
+            return cached
+
+        try:
+            # Execute rbac-tool analysis with JSON output
+            stdout = await _run_rbac_tool("analysis", "-o", "json")
+            
+            # Parse JSON output and extract findings
+            output = orjson.loads(stdout)
+            findings = _findings_adapter.validate_python(output.get("Findings", []))
+        except Exception as e:
+            # Log and re-raise: an empty list would look like a clean cluster
+            logger.exception("rbac-tool analysis failed")
+            _analysis_cache.set("findings", _FailedLookup(e), ttl=ANALYSIS_ERROR_TTL)
+            raise
+
+        _analysis_cache.set("findings", findings)
+        return findings
+
+async def fetch_rbac_policy_rules(subject: str) -> List[RbacPolicyRule]:
     """
     Retrieve RBAC policy rules for a specific subject.
     
@@ -115,6 +275,11 @@ def fetch_rbac_policy_rules(subject: str) -> List[RbacPolicyRule]:
     to a given subject (User, Group, or ServiceAccount), showing what
     permissions they have been granted.
     
+    Results are cached per subject for POLICY_RULES_TTL seconds. Failed
+    lookups are remembered for the shorter POLICY_RULES_ERROR_TTL, during
+    which a RuntimeError describing the failure is raised without re-running
+    rbac-tool.
+    
     Args:
         subject (str): Name of the subject to query (e.g., "system:serviceaccount:default:myapp")
         
@@ -122,151 +287,366 @@ def fetch_rbac_policy_rules(subject: str) -> List[RbacPolicyRule]:
         List[RbacPolicyRule]: List of policy rules with allowed actions
         
     Raises:
-        subprocess.CalledProcessError: If kubectl command fails
-        json.JSONDecodeError: If output parsing fails
+        subprocess.CalledProcessError: If rbac-tool command fails
+        TimeoutError: If rbac-tool does not finish in time
+        orjson.JSONDecodeError: If output parsing fails
+        RuntimeError: If the lookup for this subject failed within the
+            last POLICY_RULES_ERROR_TTL seconds
     """
-    # Set up in-cluster authentication for rbac-tool
-    _setup_rbac_tool_env()
+    cached = _policy_rules_cache.get(subject)
+    if isinstance(cached, _FailedLookup):
+        raise RuntimeError(f"Policy rules lookup for {subject} failed recently: {cached.reason}")
+    if cached is not None:
+        return cached
+
+    try:
+        rules = await _query_rbac_policy_rules(subject)
+    except Exception as e:
+        # Negative cache entry: avoid hammering rbac-tool for a failing subject
+        _policy_rules_cache.set(subject, _FailedLookup(e), ttl=POLICY_RULES_ERROR_TTL)
+        raise
+
+    _policy_rules_cache.set(subject, rules)
+    return rules
+
+async def _query_rbac_policy_rules(subject: str) -> List[RbacPolicyRule]:
+    """
+    Run rbac-tool to retrieve the policy rules of a subject, bypassing the cache.
     
+    Args:
+        subject (str): Name of the subject to query, matched by rbac-tool as a regex
+        
+    Returns:
+        List[RbacPolicyRule]: List of policy rules with allowed actions
+    """
     # Execute rbac-tool policy-rules command
-    result = subprocess.run(
-        ["rbac-tool", "policy-rules", "-o", "json", "-e", subject],
-        capture_output=True, check=True, timeout=30
-    )
+    stdout = await _run_rbac_tool("policy-rules", "-o", "json", "-e", subject)
     
     # Parse JSON output and convert to Pydantic models
-    data = json.loads(result.stdout)
-    return [RbacPolicyRule(**item) for item in data]
+    data = orjson.loads(stdout)
+    return _policy_rules_adapter.validate_python(data)
 
-def remove_nulls(obj):
-    """ 
-    Recursively remove keys with None values from nested dictionaries and lists.
-    
-    This utility function cleans up Kubernetes API objects by removing
-    null/None values, which helps reduce YAML output size and improves
-    readability of serialized data.
+# Subject names that Python's re and rbac-tool's Go RE2 match identically:
+# letters, digits and the separators found in user, group and
+# ServiceAccount names ("." matches any character in both engines)
+_PLAIN_SUBJECT = re.compile(r"[A-Za-z0-9:._@-]+")
+
+@lru_cache(maxsize=4096)
+def _subject_pattern(subject: str) -> re.Pattern:
+    """
+    Compile a plain subject name into the regex rbac-tool matches it as.
     
     Args:
-        obj: The object to clean (dict, list, or primitive type)
+        subject (str): Subject name accepted by _PLAIN_SUBJECT
         
     Returns:
-        Cleaned object with None values removed
-    """
-    if isinstance(obj, dict):
-        cleaned = {}
-        for k, v in obj.items():
-            v2 = remove_nulls(v)
-            # Keep non-None values and non-empty collections
-            if v2 is not None and (not isinstance(v2, (list, dict)) or v2):
-                cleaned[k] = v2
-        return cleaned
-    elif isinstance(obj, list):
-        # Recursively clean list items and filter out None/empty values
-        cleaned_list = [remove_nulls(x) for x in obj]
-        return [x for x in cleaned_list if x is not None and (not isinstance(x, (list, dict)) or x)]
-    else:
-        return obj
+        re.Pattern: The compiled pattern
+    """
+    return re.compile(subject)
 
-def who_can(verb: str, resource: str, namespace: str = None) -> List[Dict]:
+async def fetch_rbac_policy_rules_bulk(subjects: List[str]) -> Dict[str, List[RbacPolicyRule]]:
     """
-    Find all subjects who can perform a specific action on a resource.
+    Retrieve RBAC policy rules for several subjects with a single rbac-tool run.
     
-    This function performs a reverse lookup to identify which users, groups,
-    or service accounts have permission to perform a given verb on a specific
-    resource type, optionally within a specific namespace.
+    Subjects already in the per-subject cache are served from memory. The
+    remaining ones are combined into one alternation pattern, rbac-tool is
+    run once for all of them, and every returned rule is attributed to each
+    requested subject whose pattern matches its name.
+    
+    The attribution uses Python's re, while rbac-tool matches with Go's
+    RE2, and the two disagree on some constructs (\b, \s, Unicode classes,
+    $ before a newline, ...). Only plain subject names, made of characters
+    both engines read the same way, are therefore combined; for those the
+    results equal N separate fetch_rbac_policy_rules() calls at the cost of
+    one process. Any other subject is looked up on its own.
+    
+    If the combined run fails, the affected subjects also fall back to
+    individual lookups, so that one bad subject cannot fail the others. A
+    subject whose lookup fails, now or within the last
+    POLICY_RULES_ERROR_TTL seconds, is logged and mapped to an empty list.
     
     Args:
-        verb (str): The action verb to check (get, list, create, update, delete, etc.)
-        resource (str): The Kubernetes resource type (pods, services, deployments, etc.)
-        namespace (str, optional): Limit search to a specific namespace
+        subjects (List[str]): Subject names to query; duplicates are looked up once
         
     Returns:
-        List[Dict]: List of authorization rules with subject, namespace, and role info
+        Dict[str, List[RbacPolicyRule]]: Policy rules keyed by subject name,
+                                         in the order of first appearance
+    """
+    unique = list(dict.fromkeys(subjects))
+    results: Dict[str, List[RbacPolicyRule]] = {}
+    pending: List[str] = []
+    for subject in unique:
+        cached = _policy_rules_cache.get(subject)
+        if cached is None:
+            pending.append(subject)
+        elif isinstance(cached, _FailedLookup):
+            logger.warning("Policy rules lookup for subject %s failed recently: %s", subject, cached.reason)
+        else:
+            results[subject] = cached
+
+    combined = [subject for subject in pending if _PLAIN_SUBJECT.fullmatch(subject)]
+    if len(combined) > 1:
+        try:
+            rules = await _query_rbac_policy_rules("|".join(f"(?:{subject})" for subject in combined))
+        except Exception as e:
+            logger.warning("Combined policy-rules lookup failed, querying subjects one by one: %s", e)
+        else:
+            for subject in combined:
+                pattern = _subject_pattern(subject)
+                matched = [rule for rule in rules if pattern.search(rule.name)]
+                _policy_rules_cache.set(subject, matched)
+                results[subject] = matched
+
+    async def fetch_one(subject: str) -> None:
+        try:
+            results[subject] = await fetch_rbac_policy_rules(subject)
+        except Exception as e:
+            # Record the error and keep going instead of failing the whole batch
+            logger.warning("Failed to fetch policy rules for subject %s: %s", subject, e)
+
+    async with anyio.create_task_group() as tg:
+        for subject in pending:
+            if subject not in results:
+                tg.start_soon(fetch_one, subject)
+
+    return {subject: results.get(subject, []) for subject in unique}
+
+# (resourceVersion, (verb, resource) pairs) of each role, keyed by uid;
+# grown to the number of roles in the cluster by _build_policy_index()
+_role_rule_index = TTLCache(maxsize=4096)
+
+def _role_rule_pairs(role) -> frozenset:
+    """
+    Return every (verb, resource) pair a Role or ClusterRole grants.
+    
+    Each rule contributes the cross product of its verbs and resources,
+    wildcards included, so checking a permission is a few set lookups
+    instead of a scan over the role's rules. The index is memoized per
+    uid and rebuilt when the role's resourceVersion changes, so each role
+    holds exactly one entry.
+    
+    Args:
+        role: V1Role or V1ClusterRole object
         
-    Algorithm:
-        1. Retrieve all RoleBindings and ClusterRoleBindings
-        2. Get all Roles and ClusterRoles
-        3. For each binding, check if the referenced role allows the verb on the resource
-        4. Collect subjects from matching bindings
+    Returns:
+        frozenset: Set of (verb, resource) tuples
     """
-    rbac = client.RbacAuthorizationV1Api()
-    authz_rules = []
-
-    # Step 1: Get all RoleBindings and ClusterRoleBindings
-    role_bindings = rbac.list_namespaced_role_binding(namespace=namespace).items if namespace else []
-    cluster_role_bindings = rbac.list_cluster_role_binding().items
+    version = role.metadata.resource_version
+    cached = _role_rule_index.get(role.metadata.uid)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    pairs = frozenset(
+        (v, r)
+        for rule in role.rules or []
+        for v in rule.verbs or []
+        for r in rule.resources or []
+    )
+    _role_rule_index.set(role.metadata.uid, (version, pairs))
+    return pairs
 
-    # Step 2: Get all Roles and ClusterRoles
-    roles = rbac.list_namespaced_role(namespace=namespace).items if namespace else []
-    cluster_roles = rbac.list_cluster_role().items
+# Index of bindings by the (verb, resource) pairs they grant, rebuilt
+# whenever the underlying RBAC lists are refreshed
+_policy_index_cache = TTLCache(maxsize=1)
 
-    def matches_rule(rules, verb, resource):
-        """
-        Check if any rule in the list matches the specified verb and resource.
+def _build_policy_index(role_bindings, cluster_role_bindings, roles, cluster_roles):
+    """
+    Index every binding by the (verb, resource) pairs its role grants.
+    
+    Args:
+        role_bindings: RoleBindings in all namespaces
+        cluster_role_bindings: ClusterRoleBindings
+        roles: Roles in all namespaces
+        cluster_roles: ClusterRoles
         
-        Args:
-            rules: List of PolicyRule objects
-            verb (str): Verb to match against
-            resource (str): Resource to match against
-            
-        Returns:
-            bool: True if any rule matches, False otherwise
-        """
-        for rule in rules:
-            verbs = rule.verbs or []
-            resources = rule.resources or []
-
-            # Check for exact match or wildcard permissions
-            if (verb in verbs or "*" in verbs) and (resource in resources or "*" in resources):
-                return True
-        return False
-
-    # Step 3: Process RoleBindings
+    Returns:
+        Tuple of:
+        - bindings: one (namespace, authz_rules) entry per matching-capable
+          binding, RoleBindings first and ClusterRoleBindings last, in list
+          order. namespace is None for ClusterRoleBindings.
+        - index: dict mapping each granted (verb, resource) pair, wildcards
+          included, to the positions of the bindings granting it
+    """
+    # Index roles by name so each binding resolves its role in O(1)
+    roles_by_name = {(r.metadata.namespace, r.metadata.name): r for r in roles}
+    cluster_roles_by_name = {r.metadata.name: r for r in cluster_roles}
+
+    # Every role may be visited on each rebuild; keep them all cached
+    _role_rule_index.reserve(len(roles) + len(cluster_roles))
+
+    bindings = []
+    index: Dict[tuple, List[int]] = {}
+
+    def add(namespace, role, authz_rules):
+        position = len(bindings)
+        bindings.append((namespace, authz_rules))
+        for pair in _role_rule_pairs(role):
+            index.setdefault(pair, []).append(position)
+
+    # RoleBindings, which only apply within their own namespace
     for rb in role_bindings:
         role_name = rb.role_ref.name
         role_kind = rb.role_ref.kind
 
         # Find the referenced role
         if role_kind == "Role":
-            role = next((r for r in roles if r.metadata.name == role_name), None)
+            role = roles_by_name.get((rb.metadata.namespace, role_name))
         elif role_kind == "ClusterRole":
-            role = next((r for r in cluster_roles if r.metadata.name == role_name), None)
+            role = cluster_roles_by_name.get(role_name)
         else:
             continue
 
-        # Skip if role not found or doesn't match the permission
-        if not role or not matches_rule(role.rules, verb, resource):
+        if not role or not rb.subjects:
             continue
-        
-        # Add subjects from matching RoleBinding
-        if rb.subjects:
-            for subject in rb.subjects:
-                authz_rules.append({
-                    "subject": f"{subject.kind}/{subject.name}",
-                    "namespace": rb.metadata.namespace,
-                    "role": f"{role_kind}/{role_name}"
-                })
-
-    # Step 4: Process ClusterRoleBindings
+        add(rb.metadata.namespace, role, [
+            {
+                "subject": f"{subject.kind}/{subject.name}",
+                "namespace": rb.metadata.namespace,
+                "role": f"{role_kind}/{role_name}"
+            }
+            for subject in rb.subjects
+        ])
+
+    # ClusterRoleBindings, which apply everywhere
     for crb in cluster_role_bindings:
-        # Find the referenced ClusterRole
-        cr = next((r for r in cluster_roles if r.metadata.name == crb.role_ref.name), None)
-        if not cr or not matches_rule(cr.rules, verb, resource):
+        cr = cluster_roles_by_name.get(crb.role_ref.name)
+        if not cr or not crb.subjects:
             continue
-            
-        # Add subjects from matching ClusterRoleBinding
-        if crb.subjects:
-            for subject in crb.subjects:
-                ns = getattr(subject, "namespace", None) or "cluster-wide"
-                authz_rules.append({
-                    "subject": f"{subject.kind}/{subject.name}",
-                    "namespace": ns,
-                    "role": f"{crb.role_ref.kind}/{crb.role_ref.name}"
-                })
+        add(None, cr, [
+            {
+                "subject": f"{subject.kind}/{subject.name}",
+                "namespace": getattr(subject, "namespace", None) or "cluster-wide",
+                "role": f"{crb.role_ref.kind}/{crb.role_ref.name}"
+            }
+            for subject in crb.subjects
+        ])
+
+    return bindings, index
+
+def _get_policy_index():
+    """
+    Return the policy index for the current RBAC lists, building it if needed.
+    
+    The index is tied to the exact list objects it was built from, so it is
+    rebuilt as soon as _list_rbac_objects() hands out a refreshed list.
+    
+    Raises:
+        kubernetes.client.exceptions.ApiException: If a list call fails
+    """
+    sources = (
+        _list_rbac_objects("RoleBinding"),
+        _list_rbac_objects("ClusterRoleBinding"),
+        _list_rbac_objects("Role"),
+        _list_rbac_objects("ClusterRole"),
+    )
+    cached = _policy_index_cache.get("index")
+    if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+        return cached[1]
+
+    built = _build_policy_index(*sources)
+    _policy_index_cache.set("index", (sources, built))
+    return built
+
+def who_can(verb: str, resource: str, namespace: str = None) -> List[Dict]:
+    """
+    Find all subjects who can perform a specific action on a resource.
+    
+    This function performs a reverse lookup to identify which users, groups,
+    or service accounts have permission to perform a given verb on a specific
+    resource type, optionally within a specific namespace.
+    
+    Args:
+        verb (str): The action verb to check (get, list, create, update, delete, etc.)
+        resource (str): The Kubernetes resource type (pods, services, deployments, etc.)
+        namespace (str, optional): Limit search to a specific namespace
+        
+    Returns:
+        List[Dict]: List of authorization rules with subject, namespace, and role info
+        
+    Algorithm:
+        1. Retrieve all RoleBindings, ClusterRoleBindings, Roles and ClusterRoles
+        2. Index every binding by the (verb, resource) pairs its role grants
+           (done once per refresh of the RBAC lists and shared between queries)
+        3. Look up the exact pair and its three wildcard variants
+        4. Collect subjects from matching bindings, keeping RoleBindings only
+           for the requested namespace
+    """
+    bindings, index = _get_policy_index()
+
+    # Step 3: Bindings granting the pair, directly or through a wildcard
+    positions = set()
+    for pair in ((verb, resource), ("*", resource), (verb, "*"), ("*", "*")):
+        positions.update(index.get(pair, ()))
+
+    # Step 4: Collect subjects in binding order; ClusterRoleBindings always apply
+    authz_rules = []
+    for position in sorted(positions):
+        binding_namespace, rules = bindings[position]
+        if binding_namespace is None or (namespace and binding_namespace == namespace):
+            authz_rules.extend(dict(rule) for rule in rules)
 
     return authz_rules
 
-def get_all_bindings() -> List[RbacBinding]:
+@lru_cache(maxsize=8192)
+def _intern_subject(kind: str, name: str, api_group: str, namespace: Optional[str]) -> RbacSubject:
+    """
+    Return the shared RbacSubject instance for the given field values.
+    
+    Bindings frequently repeat the same subjects (e.g. system:masters), so
+    equal subjects are built once and reused across bindings and requests.
+    """
+    return RbacSubject.model_construct(kind=kind, name=name, apiGroup=api_group, namespace=namespace)
+
+@lru_cache(maxsize=8192)
+def _intern_role_ref(kind: str, name: str, api_group: str, namespace: Optional[str]) -> RbacRoleRef:
+    """
+    Return the shared RbacRoleRef instance for the given field values.
+    
+    Many bindings point at the same role (e.g. cluster-admin), so equal
+    references are built once and reused across bindings and requests.
+    """
+    return RbacRoleRef.model_construct(kind=kind, name=name, apiGroup=api_group, namespace=namespace)
+
+# (resourceVersion, raw YAML) of each binding, keyed by uid; grown to the
+# number of bindings in the cluster by _convert_bindings()
+_raw_yaml_cache = TTLCache(maxsize=4096)
+
+def _render_raw(binding, kind: str) -> str:
+    """
+    Serialize a RoleBinding or ClusterRoleBinding to YAML, memoized per version.
+    
+    The YAML only depends on the object's content, which cannot change
+    without its resourceVersion changing, so the result is cached per uid
+    and reused until the binding's resourceVersion moves on, at which point
+    the entry is replaced.
+    
+    Args:
+        binding: V1RoleBinding or V1ClusterRoleBinding object
+        kind (str): "RoleBinding" or "ClusterRoleBinding"
+        
+    Returns:
+        str: YAML representation of the binding as served by the API,
+             without null fields
+    """
+    version = binding.metadata.resource_version
+    cached = _raw_yaml_cache.get(binding.metadata.uid)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    # Convert to the API's own camelCase form in a single walk; unset
+    # (None) fields are left out, so no separate null-pruning pass is needed.
+    # List items come back without apiVersion/kind, so fill them in here
+    # rather than on the binding, which is shared through the list cache.
+    data = {
+        "apiVersion": binding.api_version or 'rbac.authorization.k8s.io/v1',
+        "kind": binding.kind or kind,
+        **get_api_client().sanitize_for_serialization(binding),
+    }
+    raw_yaml = yaml.dump(data, Dumper=YamlDumper, sort_keys=False)
+    _raw_yaml_cache.set(binding.metadata.uid, (version, raw_yaml))
+    return raw_yaml
+
+def get_all_bindings(include_raw: bool = True) -> List[RbacBinding]:
     """
     Retrieve all RBAC bindings in the cluster.
     
@@ -274,121 +654,161 @@ def get_all_bindings() -> List[RbacBinding]:
     cluster and converts them to a standardized format with raw YAML data
     for detailed inspection.
     
+    Args:
+        include_raw (bool): Render each binding's raw YAML. List views that
+                            never show it can pass False to skip the work.
+        
     Returns:
         List[RbacBinding]: Complete list of RBAC bindings with subjects,
                           role references, and raw YAML representations
                           
+    Raises:
+        kubernetes.client.exceptions.ApiException: If the bindings cannot be listed
+                          
     Note:
         This operation may be slow on clusters with many bindings.
         Each binding includes its raw YAML for debugging purposes.
+        Use iter_all_bindings() to process bindings one at a time.
     """
-    rbac = client.RbacAuthorizationV1Api()
-    bindings: List[RbacBinding] = []
-    id_counter = 0
+    return list(iter_all_bindings(include_raw))
 
-    # Process ClusterRoleBindings
+def iter_all_bindings(include_raw: bool = True) -> Iterator[RbacBinding]:
+    """
+    Return an iterator over every RBAC binding in the cluster.
+    
+    ClusterRoleBindings are yielded first, followed by RoleBindings, with
+    sequential ids starting at 0. Each binding is converted only when the
+    caller asks for it, so consumers that stream results never hold the
+    whole converted list in memory.
+    
+    Args:
+        include_raw (bool): Render each binding's raw YAML; when False,
+                            raw is left as None
+    
+    Returns:
+        Iterator[RbacBinding]: Bindings, each including its raw YAML representation
+        
+    Raises:
+        kubernetes.client.exceptions.ApiException: If the bindings cannot be
+            listed. Both lists are fetched before the iterator is returned,
+            so a failure surfaces here rather than halfway through iteration.
+        
+    Note:
+        Models are built with model_construct(), skipping validation: the
+        data comes straight from typed Kubernetes API objects, so it is
+        trusted. Validation still applies to data crossing the HTTP boundary.
+        Subjects and role references are interned and shared between
+        bindings, which is safe because those models are frozen.
+    """
+    try:
+        cluster_role_bindings = _list_rbac_objects("ClusterRoleBinding")
+    except client.exceptions.ApiException as e:
+        logger.warning("Cannot list ClusterRoleBindings: %s %s", e.status, e.reason)
+        raise
     try:
-        cluster_role_bindings = rbac.list_cluster_role_binding().items
+        role_bindings = _list_rbac_objects("RoleBinding")
     except client.exceptions.ApiException as e:
-        print("[⚠️ RBAC] Cannot list ClusterRoleBindings:", e.status)
-        cluster_role_bindings = []
+        logger.warning("Cannot list RoleBindings: %s %s", e.status, e.reason)
+        raise
 
+    return _convert_bindings(cluster_role_bindings, role_bindings, include_raw)
+
+def _convert_bindings(cluster_role_bindings, role_bindings, include_raw: bool) -> Iterator[RbacBinding]:
+    """
+    Convert listed ClusterRoleBindings and RoleBindings to RbacBinding models, lazily.
+    
+    Args:
+        cluster_role_bindings: V1ClusterRoleBinding objects
+        role_bindings: V1RoleBinding objects
+        include_raw (bool): Render each binding's raw YAML
+        
+    Yields:
+        RbacBinding: ClusterRoleBindings first, then RoleBindings, with
+                     sequential ids starting at 0
+    """
+    if include_raw:
+        # Every binding is rendered on each pass; keep them all cached
+        _raw_yaml_cache.reserve(len(cluster_role_bindings) + len(role_bindings))
+
+    id_counter = 0
+
+    # Process ClusterRoleBindings
     for crb in cluster_role_bindings:
         # Convert subjects to our model format
         subjects = [
-            RbacSubject(
-                kind=s.kind,
-                name=s.name,
-                apiGroup=s.api_group or "",
-                namespace=getattr(s, "namespace", None)  # May be present for ServiceAccounts
+            _intern_subject(
+                s.kind,
+                s.name,
+                s.api_group or "",
+                getattr(s, "namespace", None)  # May be present for ServiceAccounts
             )
             for s in crb.subjects or []
         ]
         
         # Convert role reference
-        role_ref = RbacRoleRef(
-            kind=crb.role_ref.kind,
-            name=crb.role_ref.name,
-            apiGroup=crb.role_ref.api_group,
-            namespace=None  # ClusterRole has no namespace
+        role_ref = _intern_role_ref(
+            crb.role_ref.kind,
+            crb.role_ref.name,
+            crb.role_ref.api_group,
+            None  # ClusterRole has no namespace
         )
         
-        # Ensure required fields are set for YAML serialization
-        crb.api_version = crb.api_version or 'rbac.authorization.k8s.io/v1'
-        crb.kind = crb.kind or 'ClusterRoleBinding'
-        
-        # Clean up None values and serialize to YAML
-        pruned = remove_nulls(crb.to_dict())
-        raw_yaml = yaml.safe_dump(pruned, sort_keys=False)
+        raw_yaml = _render_raw(crb, "ClusterRoleBinding") if include_raw else None
 
         # Create binding model
-        bindings.append(RbacBinding(
+        yield RbacBinding.model_construct(
             id=id_counter,
             name=crb.metadata.name,
             kind="ClusterRoleBinding",
             subjects=subjects,
             roleRef=role_ref,
             raw=raw_yaml
-        ))
+        )
         id_counter += 1
 
     # Process RoleBindings
-    try:
-        role_bindings = rbac.list_role_binding_for_all_namespaces().items
-    except client.exceptions.ApiException as e:
-        print("[⚠️ RBAC] Cannot list RoleBindings:", e.status)
-        role_bindings = []
-
     for rb in role_bindings:
         binding_namespace = rb.metadata.namespace
 
         # Convert subjects with proper namespace handling
         subjects = [
-            RbacSubject(
-                kind=s.kind,
-                name=s.name,
-                apiGroup=s.api_group or "",
-                namespace=getattr(s, "namespace", binding_namespace if s.kind == "ServiceAccount" else None)
+            _intern_subject(
+                s.kind,
+                s.name,
+                s.api_group or "",
+                getattr(s, "namespace", binding_namespace if s.kind == "ServiceAccount" else None)
             )
             for s in rb.subjects or []
         ]
 
         # Convert role reference with namespace for Roles
-        role_ref = RbacRoleRef(
-            kind=rb.role_ref.kind,
-            name=rb.role_ref.name,
-            apiGroup=rb.role_ref.api_group,
-            namespace=binding_namespace if rb.role_ref.kind == "Role" else None
+        role_ref = _intern_role_ref(
+            rb.role_ref.kind,
+            rb.role_ref.name,
+            rb.role_ref.api_group,
+            binding_namespace if rb.role_ref.kind == "Role" else None
         )
 
-        # Ensure required fields are set for YAML serialization
-        rb.api_version = rb.api_version or 'rbac.authorization.k8s.io/v1'
-        rb.kind = rb.kind or 'RoleBinding'
-        
-        # Clean up None values and serialize to YAML
-        pruned = remove_nulls(rb.to_dict())
-        raw_yaml = yaml.safe_dump(pruned, sort_keys=False)
+        raw_yaml = _render_raw(rb, "RoleBinding") if include_raw else None
 
         # Create binding model
-        bindings.append(RbacBinding(
+        yield RbacBinding.model_construct(
             id=id_counter,
             name=rb.metadata.name,
             kind="RoleBinding",
             subjects=subjects,
             roleRef=role_ref,
             raw=raw_yaml
-        ))
+        )
         id_counter += 1
 
-    return bindings
-
 def fetch_rules_for_role(role_name: str, kind: str, namespace: str = None) -> List[K8sPolicyRule]:
     """
     Retrieve policy rules for a specific Role or ClusterRole.
     
     This function fetches the detailed policy rules defined in a specific
     Role or ClusterRole, showing what verbs are allowed on which resources
-    and API groups.
+    and API groups. It is a single-role wrapper around fetch_rules_for_roles().
     
     Args:
         role_name (str): Name of the Role or ClusterRole to query
@@ -409,19 +829,67 @@ def fetch_rules_for_role(role_name: str, kind: str, namespace: str = None) -> Li
         # Get rules for a namespaced Role
         rules = fetch_rules_for_role("pod-reader", "Role", "default")
     """
-    rbac = client.RbacAuthorizationV1Api()
-
-    if kind == "ClusterRole":
-        # Retrieve ClusterRole - namespace parameter is ignored
-        role = rbac.read_cluster_role(role_name)
-    elif kind == "Role":
-        # Retrieve namespaced Role - namespace is required
-        if not namespace:
+    ref = (kind, role_name, namespace)
+    rules = fetch_rules_for_roles([ref])[ref]
+    if rules is None:
+        raise client.exceptions.ApiException(status=404, reason=f"{kind} {role_name} not found")
+    return rules
+
+def fetch_rules_for_roles(
+    refs: List[Tuple[str, str, Optional[str]]]
+) -> Dict[Tuple[str, str, Optional[str]], Optional[List[K8sPolicyRule]]]:
+    """
+    Retrieve policy rules for several Roles and ClusterRoles at once.
+    
+    Instead of one GET per role, this resolves every reference against the
+    cluster-wide Role and ClusterRole lists, which are fetched at most once
+    each and shared with the other RBAC views through _list_rbac_objects().
+    
+    Args:
+        refs (List[Tuple[str, str, Optional[str]]]): (kind, name, namespace)
+            references; namespace is required for Roles and ignored for
+            ClusterRoles
+        
+    Returns:
+        Dict: Maps each reference to its policy rules, or to None if the
+              role does not exist
+        
+    Raises:
+        ValueError: If a role kind is unsupported or a Role has no namespace
+        kubernetes.client.exceptions.ApiException: If a list call fails
+    """
+    for kind, _, namespace in refs:
+        if kind == "Role" and not namespace:
             raise ValueError("Namespace is required for Role")
-        role = rbac.read_namespaced_role(role_name, namespace)
-    else:
-        raise ValueError(f"Unsupported role kind: {kind}")
+        if kind not in ("Role", "ClusterRole"):
+            raise ValueError(f"Unsupported role kind: {kind}")
+
+    kinds = {kind for kind, _, _ in refs}
+    cluster_roles = {
+        r.metadata.name: r for r in _list_rbac_objects("ClusterRole")
+    } if "ClusterRole" in kinds else {}
+    roles = {
+        (r.metadata.namespace, r.metadata.name): r for r in _list_rbac_objects("Role")
+    } if "Role" in kinds else {}
+
+    results = {}
+    for ref in refs:
+        kind, name, namespace = ref
+        role = cluster_roles.get(name) if kind == "ClusterRole" else roles.get((namespace, name))
+        if role is None:
+            results[ref] = None
+            continue
 
-    # Extract policy rules and convert to our model format
-    rules = role.rules or []
-    return [K8sPolicyRule(**r.to_dict()) for r in rules]
+        # Extract policy rules and convert to our model format; the API
+        # objects are already typed, so the models skip validation
+        results[ref] = [
+            K8sPolicyRule.model_construct(
+                verbs=r.verbs or [],
+                apiGroups=r.api_groups or [],
+                resources=r.resources or [],
+                resourceNames=r.resource_names or [],
+                nonResourceURLs=r.non_resource_urls or [],
+            )
+            for r in role.rules or []
+        ]
+    return results
@@ -0,0 +1,28 @@
+# backend/tests/conftest.py
+"""
+Shared pytest fixtures for the Kube-Guard backend tests.
+
+The service layer keeps several module-level caches; they are emptied
+around every test so that results never leak from one test to the next.
+"""
+
+import pytest
+
+from app.services import rbac_service
+
+@pytest.fixture(autouse=True)
+def clear_service_caches():
+    """Empty every module-level cache of the RBAC service."""
+    caches = (
+        rbac_service._analysis_cache,
+        rbac_service._policy_rules_cache,
+        rbac_service._rbac_list_cache,
+        rbac_service._policy_index_cache,
+        rbac_service._role_rule_index,
+        rbac_service._raw_yaml_cache,
+    )
+    for c in caches:
+        c.clear()
+    yield
+    for c in caches:
+        c.clear()
@@ -0,0 +1,199 @@
+# backend/tests/test_cache.py
+"""
+Tests for the TTL cache and the HTTP response cache middleware.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import rbac
+from app.core import cache
+from app.core.cache import CACHE_POLICY_KEY, CACHE_TTLS, ResponseCacheMiddleware, TTLCache
+
+def make_client():
+    """
+    Build an app with one cached route whose behaviour the test controls.
+
+    Returns:
+        Tuple of the TestClient and a dict holding the call count and the
+        failure mode ("raise", "503" or None) of the route
+    """
+    state = {"calls": 0, "fail": None}
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/items", openapi_extra={CACHE_POLICY_KEY: "normal"})
+    def items(q: str = ""):
+        state["calls"] += 1
+        if state["fail"] == "raise":
+            raise RuntimeError("backend down")
+        if state["fail"] == "503":
+            raise HTTPException(status_code=503, detail="backend down")
+        return {"calls": state["calls"], "q": q}
+
+    @app.get("/uncached")
+    def uncached():
+        state["calls"] += 1
+        return {"calls": state["calls"]}
+
+    return TestClient(app, raise_server_exceptions=False), state
+
+def test_ttl_cache_expires_and_keeps_stale():
+    c = TTLCache(ttl=0)
+    c.set("k", 1)
+    assert c.get("k") is None
+    assert c.get_stale("k") == 1
+
+def test_ttl_cache_evicts_least_recently_used():
+    c = TTLCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert c.get("a") == 1
+    assert c.get("b") is None
+    assert c.get("c") == 3
+
+def test_ttl_cache_reserve_only_grows():
+    c = TTLCache(maxsize=2)
+    c.reserve(5)
+    for i in range(5):
+        c.set(i, i)
+    assert len(c) == 5
+    c.reserve(1)
+    assert c.maxsize == 5
+
+def test_miss_then_hit():
+    http, state = make_client()
+
+    first = http.get("/items")
+    second = http.get("/items")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert state["calls"] == 1
+
+def test_max_age_is_the_remaining_lifetime(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    http, _ = make_client()
+
+    miss = http.get("/items")
+    clock[0] += 20
+    hit = http.get("/items")
+
+    assert miss.headers["Cache-Control"] == f"max-age={CACHE_TTLS['normal']}"
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.headers["Cache-Control"] == f"max-age={CACHE_TTLS['normal'] - 20}"
+
+def test_query_parameters_are_part_of_the_key():
+    http, state = make_client()
+
+    http.get("/items?q=a")
+    response = http.get("/items?q=b")
+
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["q"] == "b"
+    assert state["calls"] == 2
+
+def test_routes_without_a_policy_are_not_cached():
+    http, state = make_client()
+
+    http.get("/uncached")
+    response = http.get("/uncached")
+
+    assert "X-Cache" not in response.headers
+    assert state["calls"] == 2
+
+@pytest.mark.parametrize("failure", ["raise", "503"])
+def test_stale_entry_served_when_refresh_fails(monkeypatch, failure):
+    # A zero TTL makes every entry expire as soon as it is stored
+    monkeypatch.setitem(CACHE_TTLS, "normal", 0)
+    http, state = make_client()
+    fresh = http.get("/items")
+
+    state["fail"] = failure
+    response = http.get("/items")
+
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "STALE"
+    assert response.headers["Warning"].startswith("110")
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.json() == fresh.json()
+
+def test_failure_without_stale_entry_is_not_cached():
+    http, state = make_client()
+    state["fail"] = "503"
+
+    failed = http.get("/items")
+    state["fail"] = None
+    recovered = http.get("/items")
+
+    assert failed.status_code == 503
+    assert "X-Cache" not in failed.headers
+    assert recovered.status_code == 200
+    assert recovered.headers["X-Cache"] == "MISS"
+
+def test_etag_revalidation():
+    http, _ = make_client()
+    etag = http.get("/items").headers["ETag"]
+
+    assert etag.startswith('W/"')
+    for if_none_match in (etag, etag[2:], f'"other", {etag}', "*"):
+        response = http.get("/items", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    response = http.get("/items", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag
+
+def test_etag_is_shared_by_gzip_and_identity_encodings():
+    from app.core.compression import StreamingGZipMiddleware
+
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    app.add_middleware(StreamingGZipMiddleware, minimum_size=1)
+
+    @app.get("/items", openapi_extra={CACHE_POLICY_KEY: "normal"})
+    def items():
+        return {"data": "x" * 2048}
+
+    http = TestClient(app)
+    gzipped = http.get("/items", headers={"Accept-Encoding": "gzip"})
+    identity = http.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert gzipped.headers["ETag"] == identity.headers["ETag"]
+    revalidated = http.get(
+        "/items", headers={"Accept-Encoding": "gzip", "If-None-Match": identity.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+def test_failed_analysis_is_not_cached(monkeypatch):
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    app.include_router(rbac.router, prefix="/rbac")
+    http = TestClient(app)
+
+    async def failing():
+        raise RuntimeError("rbac-tool failed")
+
+    async def succeeding():
+        return []
+
+    monkeypatch.setattr(rbac, "run_rbac_analysis", failing)
+    failed = http.get("/rbac/analysis")
+    monkeypatch.setattr(rbac, "run_rbac_analysis", succeeding)
+    recovered = http.get("/rbac/analysis")
+
+    assert failed.status_code == 503
+    assert "X-Cache" not in failed.headers
+    assert recovered.status_code == 200
+    assert recovered.headers["X-Cache"] == "MISS"
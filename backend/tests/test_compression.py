@@ -0,0 +1,71 @@
+# backend/tests/test_compression.py
+"""
+Tests for the streaming gzip middleware.
+"""
+
+import zlib
+
+import anyio
+from starlette.responses import StreamingResponse
+
+from app.core.compression import StreamingGZipMiddleware
+
+LINES = [b'{"id": %d, "name": "binding-%d"}\n' % (i, i) for i in range(5)]
+
+def run(app, accept_encoding: bytes) -> list:
+    """Call an ASGI app with a GET request and return the messages it sends."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/bindings/stream",
+        "raw_path": b"/bindings/stream",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding)],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    messages = []
+
+    async def receive():
+        # The client never disconnects while the stream is produced
+        await anyio.sleep_forever()
+
+    async def send(message):
+        messages.append(message)
+
+    anyio.run(app, scope, receive, send)
+    return messages
+
+async def ndjson_stream(scope, receive, send):
+    async def lines():
+        for line in LINES:
+            yield line
+
+    response = StreamingResponse(lines(), media_type="application/x-ndjson")
+    await response(scope, receive, send)
+
+def test_streamed_chunks_are_flushed_one_by_one():
+    messages = run(StreamingGZipMiddleware(ndjson_stream, minimum_size=1), b"gzip")
+
+    headers = dict(messages[0]["headers"])
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+    assert headers[b"content-encoding"] == b"gzip"
+    assert len(bodies) == len(LINES) + 1
+
+    # Every chunk decompresses to its line as soon as it is received
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for body, line in zip(bodies, LINES):
+        assert decompressor.decompress(body) == line
+    assert decompressor.decompress(bodies[-1]) + decompressor.flush() == b""
+    assert decompressor.eof
+
+def test_identity_requests_are_not_compressed():
+    messages = run(StreamingGZipMiddleware(ndjson_stream, minimum_size=1), b"identity")
+
+    headers = dict(messages[0]["headers"])
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body"]
+    assert b"content-encoding" not in headers
+    assert b"".join(bodies) == b"".join(LINES)
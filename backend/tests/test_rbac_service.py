@@ -0,0 +1,369 @@
+# backend/tests/test_rbac_service.py
+"""
+Tests for the RBAC service: cached and batched policy-rules lookups, the
+who_can policy index, the memoized raw YAML of bindings and rule pairs of
+roles, and the shared rbac-tool analysis.
+
+Kubernetes objects are built in memory and rbac-tool is replaced by a fake
+query function, so no cluster or binary is needed.
+"""
+
+import random
+import re
+
+import anyio
+import pytest
+import yaml
+from kubernetes import client
+
+from app.models.rbac import RbacPolicyRule
+from app.services import rbac_service
+
+VERBS = ["get", "list", "delete", "*"]
+RESOURCES = ["pods", "secrets", "nodes", "*"]
+NAMESPACES = ["a", "b"]
+
+def policy_rule(name: str) -> RbacPolicyRule:
+    return RbacPolicyRule(kind="ClusterRole", name=name, allowedTo=[])
+
+@pytest.fixture
+def rbac_tool(monkeypatch):
+    """
+    Replace rbac-tool with a fake that knows a fixed set of subjects.
+
+    Returns:
+        list: The patterns rbac-tool was queried with, in call order
+    """
+    known = ["alice", "bob", "system:serviceaccount:default:app", "alice-admin"]
+    queries = []
+
+    async def query(pattern):
+        queries.append(pattern)
+        if pattern == "broken":
+            raise RuntimeError("rbac-tool failed")
+        return [policy_rule(name) for name in known if re.search(pattern, name)]
+
+    monkeypatch.setattr(rbac_service, "_query_rbac_policy_rules", query)
+    return queries
+
+def test_policy_rules_are_cached(rbac_tool):
+    first = anyio.run(rbac_service.fetch_rbac_policy_rules, "alice")
+    second = anyio.run(rbac_service.fetch_rbac_policy_rules, "alice")
+
+    assert [r.name for r in first] == ["alice", "alice-admin"]
+    assert second == first
+    assert rbac_tool == ["alice"]
+
+def test_bulk_attributes_rules_like_single_lookups(rbac_tool):
+    subjects = ["alice", "bob", "system:serviceaccount:.*", "nobody", "alice"]
+
+    bulk = anyio.run(rbac_service.fetch_rbac_policy_rules_bulk, subjects)
+    rbac_service._policy_rules_cache.clear()
+    single = {s: anyio.run(rbac_service.fetch_rbac_policy_rules, s) for s in subjects}
+
+    assert list(bulk) == ["alice", "bob", "system:serviceaccount:.*", "nobody"]
+    assert bulk == single
+    # "alice" is a regex, so it also matches alice-admin, as in rbac-tool
+    assert [r.name for r in bulk["alice"]] == ["alice", "alice-admin"]
+    assert bulk["nobody"] == []
+    # Plain names share one run; the pattern is looked up on its own, as
+    # Python's re and rbac-tool's RE2 do not agree on every construct
+    assert rbac_tool[0] == "(?:alice)|(?:bob)|(?:nobody)"
+    assert rbac_tool[1] == "system:serviceaccount:.*"
+    assert len(rbac_tool) == 2 + 4
+
+def test_bulk_serves_cached_subjects_without_rbac_tool(rbac_tool):
+    anyio.run(rbac_service.fetch_rbac_policy_rules_bulk, ["alice", "bob"])
+    rbac_tool.clear()
+
+    result = anyio.run(rbac_service.fetch_rbac_policy_rules_bulk, ["bob", "alice"])
+
+    assert rbac_tool == []
+    assert [r.name for r in result["bob"]] == ["bob"]
+
+def test_bulk_isolates_invalid_and_failing_subjects(rbac_tool):
+    result = anyio.run(rbac_service.fetch_rbac_policy_rules_bulk, ["bob", "(", "broken"])
+
+    assert [r.name for r in result["bob"]] == ["bob"]
+    assert result["("] == []
+    assert result["broken"] == []
+
+def test_failed_lookup_is_negatively_cached(rbac_tool, caplog):
+    with pytest.raises(RuntimeError) as first:
+        anyio.run(rbac_service.fetch_rbac_policy_rules, "broken")
+    with pytest.raises(RuntimeError) as second:
+        anyio.run(rbac_service.fetch_rbac_policy_rules, "broken")
+    result = anyio.run(rbac_service.fetch_rbac_policy_rules_bulk, ["broken"])
+
+    assert rbac_tool == ["broken"]
+    # A fresh exception per call, so tracebacks never pile up on one instance
+    assert second.value is not first.value
+    assert "failed recently" in str(second.value)
+    assert result == {"broken": []}
+    assert "broken" in caplog.text
+
+def meta(name, namespace=None):
+    return client.V1ObjectMeta(
+        name=name, namespace=namespace, uid=f"{namespace}/{name}/{random.random()}", resource_version="1"
+    )
+
+def random_rules():
+    return [
+        client.V1PolicyRule(
+            verbs=random.sample(VERBS, random.randint(0, 2)),
+            resources=random.sample(RESOURCES, random.randint(0, 2)),
+        )
+        for _ in range(random.randint(0, 3))
+    ]
+
+def random_subjects():
+    subjects = [
+        client.RbacV1Subject(
+            kind=random.choice(["User", "ServiceAccount"]),
+            name=f"s{random.randint(0, 5)}",
+            namespace=random.choice([None, "a"]),
+        )
+        for _ in range(random.randint(0, 2))
+    ]
+    return subjects or None
+
+def random_cluster():
+    """Build random Role, ClusterRole and binding lists, keyed by kind."""
+    role_names = ["r0", "r1", "r2", "cr0", "cr1", "cr2", "missing"]
+    return {
+        "Role": [
+            client.V1Role(metadata=meta(f"r{i % 3}", random.choice(NAMESPACES)), rules=random_rules())
+            for i in range(4)
+        ],
+        "ClusterRole": [
+            client.V1ClusterRole(metadata=meta(f"cr{i}"), rules=random_rules())
+            for i in range(3)
+        ],
+        "RoleBinding": [
+            client.V1RoleBinding(
+                metadata=meta(f"rb{i}", random.choice(NAMESPACES)),
+                role_ref=client.V1RoleRef(
+                    api_group="", kind=random.choice(["Role", "ClusterRole"]), name=random.choice(role_names)
+                ),
+                subjects=random_subjects(),
+            )
+            for i in range(5)
+        ],
+        "ClusterRoleBinding": [
+            client.V1ClusterRoleBinding(
+                metadata=meta(f"crb{i}"),
+                role_ref=client.V1RoleRef(api_group="", kind="ClusterRole", name=random.choice(role_names)),
+                subjects=random_subjects(),
+            )
+            for i in range(4)
+        ],
+    }
+
+def reference_who_can(cluster, verb, resource, namespace=None):
+    """Straightforward scan of every binding, as who_can worked before the index."""
+    def allows(role):
+        return any(
+            (verb in (rule.verbs or []) or "*" in (rule.verbs or []))
+            and (resource in (rule.resources or []) or "*" in (rule.resources or []))
+            for rule in role.rules or []
+        )
+
+    roles = {(r.metadata.namespace, r.metadata.name): r for r in cluster["Role"]}
+    cluster_roles = {r.metadata.name: r for r in cluster["ClusterRole"]}
+    found = []
+    if namespace:
+        for rb in cluster["RoleBinding"]:
+            if rb.metadata.namespace != namespace:
+                continue
+            if rb.role_ref.kind == "Role":
+                role = roles.get((rb.metadata.namespace, rb.role_ref.name))
+            else:
+                role = cluster_roles.get(rb.role_ref.name)
+            if role and allows(role):
+                for s in rb.subjects or []:
+                    found.append({
+                        "subject": f"{s.kind}/{s.name}",
+                        "namespace": rb.metadata.namespace,
+                        "role": f"{rb.role_ref.kind}/{rb.role_ref.name}",
+                    })
+    for crb in cluster["ClusterRoleBinding"]:
+        role = cluster_roles.get(crb.role_ref.name)
+        if role and allows(role):
+            for s in crb.subjects or []:
+                found.append({
+                    "subject": f"{s.kind}/{s.name}",
+                    "namespace": s.namespace or "cluster-wide",
+                    "role": f"{crb.role_ref.kind}/{crb.role_ref.name}",
+                })
+    return found
+
+def use_cluster(monkeypatch, cluster):
+    monkeypatch.setattr(rbac_service, "_list_rbac_objects", lambda kind: cluster[kind])
+
+def test_who_can_matches_reference_on_random_clusters(monkeypatch):
+    random.seed(1234)
+    for _ in range(200):
+        cluster = random_cluster()
+        use_cluster(monkeypatch, cluster)
+        for verb in ["get", "list", "delete", "patch"]:
+            for resource in ["pods", "secrets", "nodes", "configmaps"]:
+                for namespace in [None, "a", "b", "c"]:
+                    expected = reference_who_can(cluster, verb, resource, namespace)
+                    assert rbac_service.who_can(verb, resource, namespace) == expected
+
+def test_who_can_index_follows_list_refreshes(monkeypatch):
+    cluster = {
+        "Role": [],
+        "ClusterRole": [client.V1ClusterRole(
+            metadata=meta("reader"), rules=[client.V1PolicyRule(verbs=["get"], resources=["pods"])]
+        )],
+        "RoleBinding": [],
+        "ClusterRoleBinding": [client.V1ClusterRoleBinding(
+            metadata=meta("crb"),
+            role_ref=client.V1RoleRef(api_group="", kind="ClusterRole", name="reader"),
+            subjects=[client.RbacV1Subject(kind="User", name="alice")],
+        )],
+    }
+    use_cluster(monkeypatch, cluster)
+    assert [r["subject"] for r in rbac_service.who_can("get", "pods")] == ["User/alice"]
+
+    # A refreshed list is a new object, which invalidates the index
+    cluster["ClusterRoleBinding"] = []
+    assert rbac_service.who_can("get", "pods") == []
+
+def test_who_can_results_are_independent_copies(monkeypatch):
+    random.seed(99)
+    use_cluster(monkeypatch, random_cluster())
+
+    for rule in rbac_service.who_can("*", "*", "a"):
+        rule["subject"] = "tampered"
+
+    assert all(r["subject"] != "tampered" for r in rbac_service.who_can("*", "*", "a"))
+
+def random_binding(i):
+    """Build a random binding with a mix of set and unset optional fields."""
+    subjects = [
+        client.RbacV1Subject(
+            kind=random.choice(["User", "Group", "ServiceAccount"]),
+            name=f"subject-{random.randint(0, 9)}",
+            api_group=random.choice([None, "rbac.authorization.k8s.io"]),
+            namespace=random.choice([None, "default"]),
+        )
+        for _ in range(random.randint(0, 3))
+    ]
+    metadata = client.V1ObjectMeta(
+        name=f"binding-{i}",
+        namespace=random.choice([None, "default"]),
+        uid=f"uid-{i}",
+        resource_version=str(random.randint(1, 5)),
+        labels=random.choice([None, {}, {"app": "x"}]),
+        annotations=random.choice([None, {"note": "y"}]),
+    )
+    role_ref = client.V1RoleRef(api_group="rbac.authorization.k8s.io", kind="ClusterRole", name="view")
+    return client.V1ClusterRoleBinding(metadata=metadata, role_ref=role_ref, subjects=subjects or None)
+
+def without_nulls(value):
+    """Reference null pruning: drop None values from nested dicts and lists."""
+    if isinstance(value, dict):
+        return {k: without_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [without_nulls(v) for v in value if v is not None]
+    return value
+
+def test_render_raw_has_no_nulls_on_random_bindings(monkeypatch):
+    api_client = client.ApiClient()
+    monkeypatch.setattr(rbac_service, "get_api_client", lambda: api_client)
+    random.seed(42)
+
+    for i in range(300):
+        binding = random_binding(i)
+        data = yaml.safe_load(rbac_service._render_raw(binding, "ClusterRoleBinding"))
+
+        assert data["apiVersion"] == "rbac.authorization.k8s.io/v1"
+        assert data["kind"] == "ClusterRoleBinding"
+        assert data == without_nulls(data)
+        assert data["metadata"]["name"] == f"binding-{i}"
+        assert data["roleRef"] == {
+            "apiGroup": "rbac.authorization.k8s.io", "kind": "ClusterRole", "name": "view"
+        }
+
+def test_render_raw_is_memoized_per_uid_and_version(monkeypatch):
+    api_client = client.ApiClient()
+    monkeypatch.setattr(rbac_service, "get_api_client", lambda: api_client)
+    binding = random_binding(0)
+    binding.metadata.resource_version = "1"
+
+    first = rbac_service._render_raw(binding, "ClusterRoleBinding")
+    binding.metadata.name = "renamed"
+    assert rbac_service._render_raw(binding, "ClusterRoleBinding") is first
+
+    binding.metadata.resource_version = "2"
+    updated = rbac_service._render_raw(binding, "ClusterRoleBinding")
+    assert "renamed" in updated
+    assert len(rbac_service._raw_yaml_cache) == 1
+
+def test_binding_caches_hold_every_binding(monkeypatch):
+    api_client = client.ApiClient()
+    monkeypatch.setattr(rbac_service, "get_api_client", lambda: api_client)
+    random.seed(7)
+    bindings = [random_binding(i) for i in range(rbac_service._raw_yaml_cache.maxsize + 10)]
+
+    list(rbac_service._convert_bindings(bindings, [], include_raw=True))
+
+    assert len(rbac_service._raw_yaml_cache) == len(bindings)
+
+def test_role_rule_pairs_are_memoized_per_uid_and_version():
+    role = client.V1ClusterRole(
+        metadata=meta("reader"), rules=[client.V1PolicyRule(verbs=["get", "list"], resources=["pods"])]
+    )
+
+    pairs = rbac_service._role_rule_pairs(role)
+    role.rules = []
+    assert rbac_service._role_rule_pairs(role) is pairs
+
+    role.metadata.resource_version = "2"
+    assert rbac_service._role_rule_pairs(role) == frozenset()
+    assert len(rbac_service._role_rule_index) == 1
+
+def test_analysis_failure_is_shared_by_queued_callers(monkeypatch):
+    calls = []
+
+    async def failing_rbac_tool(*args):
+        calls.append(args)
+        await anyio.sleep(0.05)
+        raise RuntimeError("rbac-tool failed")
+
+    monkeypatch.setattr(rbac_service, "_run_rbac_tool", failing_rbac_tool)
+    monkeypatch.setattr(rbac_service, "_analysis_lock", None)
+    errors = []
+
+    async def analyse():
+        try:
+            await rbac_service.run_rbac_analysis()
+        except RuntimeError as e:
+            errors.append(e)
+
+    async def main():
+        async with anyio.create_task_group() as tg:
+            for _ in range(4):
+                tg.start_soon(analyse)
+
+    anyio.run(main)
+
+    assert len(calls) == 1
+    assert len(errors) == 4
+    assert len({id(e) for e in errors}) == 4
+
+def test_analysis_result_is_reused(monkeypatch):
+    calls = []
+
+    async def rbac_tool(*args):
+        calls.append(args)
+        return b'{"Findings": []}'
+
+    monkeypatch.setattr(rbac_service, "_run_rbac_tool", rbac_tool)
+    monkeypatch.setattr(rbac_service, "_analysis_lock", None)
+
+    assert anyio.run(rbac_service.run_rbac_analysis) == []
+    assert anyio.run(rbac_service.run_rbac_analysis) == []
+    assert len(calls) == 1